@@ -0,0 +1,99 @@
+"""
+Failure Artifacts
+Captures a screenshot, DOM snapshot, browser console log and recent network
+activity when a test fails, and stores them next to the HTML report.
+
+Artifacts are content-addressed: the file name is the SHA-256 of the content,
+so identical artifacts from repeated failures are written once. Text
+artifacts are gzip-compressed; screenshots are already compressed PNGs.
+The report links to the files instead of embedding them.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+
+ARTIFACTS_DIR = os.getenv("ARTIFACTS_DIR", "reports/artifacts")
+
+# Only the most recent network entries are useful for a failure
+NETWORK_ENTRIES = 50
+
+NETWORK_SCRIPT = """
+return performance.getEntriesByType('resource').slice(-arguments[0]).map(e => ({
+    url: e.name,
+    type: e.initiatorType,
+    status: e.responseStatus,
+    start_ms: Math.round(e.startTime),
+    duration_ms: Math.round(e.duration),
+    bytes: e.transferSize
+}));
+"""
+
+
+def enable_console_log(chrome_options):
+    """Asks Chrome to keep console messages so they can be read on failure."""
+    prefs = dict(chrome_options.capabilities.get("goog:loggingPrefs", {}))
+    prefs["browser"] = "ALL"
+    chrome_options.set_capability("goog:loggingPrefs", prefs)
+
+
+def store(data, extension, directory=ARTIFACTS_DIR, compress=True):
+    """
+    Stores bytes under their content hash and returns the file path.
+    Existing artifacts are not rewritten.
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    name = f"{digest[:2]}/{digest}.{extension}" + (".gz" if compress else "")
+    path = os.path.join(directory, name)
+
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file first so a parallel run never sees half a file
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            # mtime=0 keeps the compressed bytes identical for identical content
+            f.write(gzip.compress(data, mtime=0) if compress else data)
+        os.replace(temp_path, path)
+
+    return path
+
+
+def capture_failure(driver, report_dir=".", directory=ARTIFACTS_DIR):
+    """
+    Collects every available artifact from the browser.
+    Returns a list of (label, link) for the ones that were captured, with
+    links relative to `report_dir` so they resolve from the HTML report
+    wherever ARTIFACTS_DIR points.
+    """
+    collectors = [
+        ("Screenshot", lambda: (driver.get_screenshot_as_png(), "png", False)),
+        ("DOM snapshot", lambda: (driver.page_source.encode("utf-8"), "html", True)),
+        ("Console log", lambda: (_to_json(_console_messages(driver)), "json", True)),
+        ("Network log", lambda: (_to_json(driver.execute_script(NETWORK_SCRIPT, NETWORK_ENTRIES)), "json", True)),
+    ]
+
+    captured = []
+    for label, collect in collectors:
+        try:
+            data, extension, compress = collect()
+        except Exception as e:
+            # The browser may already be gone; capture what we can
+            print(f"Could not capture {label.lower()}: {e}")
+            continue
+        path = store(data, extension, directory, compress)
+        link = os.path.relpath(os.path.abspath(path), os.path.abspath(report_dir))
+        captured.append((label, link.replace(os.sep, "/")))
+    return captured
+
+
+def _console_messages(driver):
+    # Timestamps differ on every run and would defeat deduplication
+    return [
+        {k: v for k, v in entry.items() if k != "timestamp"}
+        for entry in driver.get_log("browser")
+    ]
+
+
+def _to_json(value):
+    return json.dumps(value, indent=1, sort_keys=True).encode("utf-8")
@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+"""
+API Capacity Finder
+Ramps the request arrival rate against the API until p99 latency or the
+error rate crosses a limit, and reports the knee point for each endpoint.
+
+Each rate is held in fixed windows until consecutive windows agree (a rate
+that never settles counts as failing), and the server container's CPU and
+memory (from `docker stats`) are recorded per step.
+
+Usage:
+    python capacity.py                                  # Step search, both endpoints
+    python capacity.py --mode binary --max-rate 400     # Binary search
+    python capacity.py --endpoint todos --p99-ms 250    # Single endpoint, tighter limit
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from loadlib import StatsSampler, register_user, send_request, summarize
+
+# Consecutive windows whose p99 differ by less than this are considered stable
+STABILITY_TOLERANCE = 0.15
+
+# ...or by less than this many milliseconds, since tiny p99s jitter a lot
+STABILITY_FLOOR_MS = 5
+
+# A step fails if the server cannot keep up with this share of the target rate
+MIN_THROUGHPUT_RATIO = 0.9
+
+
+# ==================== Workload ====================
+
+def prepare_user(base_url):
+    """Registers a throwaway user with a few todos and returns (credentials, token)."""
+    credentials, data = register_user(base_url, "capacity")
+    token = data["token"]
+
+    for i in range(5):
+        send_request(
+            base_url, "POST", "/api/todos",
+            {"Content-Type": "application/json", "Authorization": f"Bearer {token}"},
+            json.dumps({"title": f"Capacity todo {i}", "priority": "medium"})
+        )
+    return credentials, token
+
+
+def build_endpoints(credentials, token):
+    """Returns endpoint name -> (method, path, headers, body, expected status)."""
+    return {
+        "todos": ("GET", "/api/todos", {"Authorization": f"Bearer {token}"}, None, 200),
+        "login": (
+            "POST", "/api/auth/login", {"Content-Type": "application/json"},
+            json.dumps({"email": credentials["email"], "password": credentials["password"]}), 200
+        ),
+    }
+
+
+def run_window(base_url, endpoint, rate, duration, pool):
+    """
+    Issues requests at a fixed arrival rate (open loop) for `duration`
+    seconds. Returns the window summary plus the achieved throughput.
+    """
+    method, path, headers, body, expected = endpoint
+    samples = []
+    futures = []
+
+    def fire(scheduled):
+        status, _, _ = send_request(base_url, method, path, headers, body, timeout=10)
+        # Timed from the scheduled arrival so time queued behind busy
+        # workers counts too (no coordinated omission)
+        samples.append(((time.perf_counter() - scheduled) * 1000, status == expected))
+
+    interval = 1.0 / rate
+    start = time.perf_counter()
+    next_at = start
+    while next_at < start + duration:
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        futures.append(pool.submit(fire, next_at))
+        next_at += interval
+
+    for future in futures:
+        future.result()
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(samples)
+    summary["throughput"] = len(samples) / elapsed
+    return summary
+
+
+def run_step(base_url, endpoint, rate, window, max_windows, pool):
+    """
+    Holds one arrival rate until two consecutive windows have a similar p99
+    (or max_windows is reached, which marks the step unstable and failing)
+    and returns the last window's summary with the container stats for the
+    whole step.
+    """
+    previous = None
+    with StatsSampler() as sampler:
+        for _ in range(max_windows):
+            summary = run_window(base_url, endpoint, rate, window, pool)
+            if previous and abs(summary["p99"] - previous["p99"]) <= max(STABILITY_TOLERANCE * previous["p99"], STABILITY_FLOOR_MS):
+                summary["stable"] = True
+                break
+            previous = summary
+        else:
+            summary["stable"] = False
+    summary.update(sampler.summary())
+    summary["rate"] = rate
+    return summary
+
+
+def passes(summary, args):
+    """Returns (ok, reason) for a step against the configured limits."""
+    if not summary["stable"]:
+        return False, "p99 did not stabilize"
+    if summary["p99"] > args.p99_ms:
+        return False, f"p99 {summary['p99']:.0f}ms > {args.p99_ms:.0f}ms"
+    if summary["error_rate"] > args.max_error_rate:
+        return False, f"errors {summary['error_rate'] * 100:.1f}% > {args.max_error_rate * 100:.1f}%"
+    if summary["throughput"] < MIN_THROUGHPUT_RATIO * summary["rate"]:
+        return False, f"throughput {summary['throughput']:.0f}/s behind target"
+    return True, ""
+
+
+def print_step(summary, ok, reason):
+    """Prints one line per load step."""
+    cpu = f"{summary['cpu']:.0f}%" if summary["cpu"] is not None else "n/a"
+    mem = f"{summary['mem_mib']:.0f}MiB" if summary["mem_mib"] is not None else "n/a"
+    status = "✅" if ok else f"❌ {reason}"
+    print(
+        f"  {summary['rate']:>7.1f} req/s  p99 {summary['p99']:>7.1f}ms  "
+        f"err {summary['error_rate'] * 100:>5.1f}%  cpu {cpu:>5}  mem {mem:>8}  {status}"
+    )
+
+
+def find_knee(base_url, endpoint, args):
+    """
+    Searches for the highest sustainable arrival rate.
+    Returns (best passing step, first failing step) - either may be None.
+    """
+    best, failed = None, None
+
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        def measure(rate):
+            summary = run_step(base_url, endpoint, rate, args.window, args.max_windows, pool)
+            ok, reason = passes(summary, args)
+            summary["reason"] = reason
+            print_step(summary, ok, reason)
+            return ok, summary
+
+        if args.mode == "step":
+            rate = args.start_rate
+            while rate <= args.max_rate:
+                ok, summary = measure(rate)
+                if not ok:
+                    failed = summary
+                    break
+                best = summary
+                rate += args.step
+        else:
+            low, high = args.start_rate, args.max_rate
+            ok, summary = measure(low)
+            if not ok:
+                return None, summary
+            best = summary
+            while high - low > args.precision:
+                mid = (low + high) / 2
+                ok, summary = measure(mid)
+                if ok:
+                    best, low = summary, mid
+                else:
+                    failed, high = summary, mid
+
+    return best, failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find the maximum sustainable request rate of the API")
+    parser.add_argument("--url", default=os.getenv("API_URL", "http://localhost:5000"),
+                        help="Base URL serving /api (default: API_URL)")
+    parser.add_argument("--endpoint", choices=["todos", "login", "all"], default="all")
+    parser.add_argument("--mode", choices=["step", "binary"], default="step")
+    parser.add_argument("--start-rate", type=float, default=10, help="First arrival rate (req/s)")
+    parser.add_argument("--step", type=float, default=10, help="Rate increment in step mode")
+    parser.add_argument("--max-rate", type=float, default=500, help="Upper bound for the search")
+    parser.add_argument("--precision", type=float, default=5, help="Binary search resolution (req/s)")
+    parser.add_argument("--window", type=float, default=5, help="Seconds per measurement window")
+    parser.add_argument("--max-windows", type=int, default=4, help="Windows to wait for stability")
+    parser.add_argument("--p99-ms", type=float, default=500, help="p99 latency limit")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="Error rate limit (0-1)")
+    parser.add_argument("--workers", type=int, default=256, help="Max in-flight requests")
+    args = parser.parse_args()
+
+    credentials, token = prepare_user(args.url)
+    endpoints = build_endpoints(credentials, token)
+    selected = list(endpoints) if args.endpoint == "all" else [args.endpoint]
+
+    knees = {}
+    for name in selected:
+        print(f"\n{'='*60}")
+        print(f"📈 Capacity search: {endpoints[name][0]} {endpoints[name][1]} ({args.mode})")
+        print(f"{'='*60}")
+        knees[name] = find_knee(args.url, endpoints[name], args)
+
+    print(f"\n{'='*60}")
+    print("🏁 Knee points")
+    print(f"{'='*60}")
+    for name, (best, failed) in knees.items():
+        if best:
+            print(f"  {name:<8} {best['rate']:.1f} req/s sustained (p99 {best['p99']:.1f}ms)")
+        else:
+            print(f"  {name:<8} no rate passed; lower --start-rate")
+        if failed:
+            print(f"  {'':<8} breaks at {failed['rate']:.1f} req/s: {failed['reason']}")
+        elif best:
+            print(f"  {'':<8} limit not reached below --max-rate")
+
+    sys.exit(0 if all(best for best, _ in knees.values()) else 1)
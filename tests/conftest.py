@@ -6,13 +6,20 @@ This file contains shared fixtures used across all test files.
 import pytest
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
+import json
 import time
 import os
 
+import artifacts
+import loadlib
+import perf_history
+import traffic
+
 # Configuration
 BASE_URL = os.getenv("APP_URL", "http://localhost:3000")
 HEADLESS = os.getenv("HEADLESS", "true").lower() == "true"
+CAPTURE_TRAFFIC = os.getenv("CAPTURE_TRAFFIC")  # File to record /api/* traffic into
+RESULTS_FILE = os.getenv("RESULTS_FILE", "reports/test_results.json")
 
 # Test user credentials
 TEST_USER = {
@@ -23,32 +30,194 @@ TEST_USER = {
 
 
 @pytest.fixture(scope="function")
-def driver():
+def driver(request):
     """
     Creates a Chrome WebDriver instance for each test.
     Uses headless mode for CI/CD pipelines.
+    Records the test's API traffic when CAPTURE_TRAFFIC is set.
     """
-    chrome_options = Options()
-    
-    if HEADLESS:
-        chrome_options.add_argument("--headless=new")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-    
-    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options = loadlib.chrome_options(HEADLESS)
     chrome_options.add_argument("--disable-extensions")
     
+    artifacts.enable_console_log(chrome_options)
+    if CAPTURE_TRAFFIC:
+        traffic.enable_capture(chrome_options)
+    
     # Initialize driver - let Selenium Manager handle driver automatically
     driver = webdriver.Chrome(options=chrome_options)
     driver.implicitly_wait(10)
     
+    if CAPTURE_TRAFFIC:
+        driver, recorder = traffic.recording_driver(driver)
+    
     yield driver
     
+    _result(request.node.nodeid).update(page_metrics(driver))
+    
+    if CAPTURE_TRAFFIC:
+        try:
+            traffic.save_session(CAPTURE_TRAFFIC, request.node.nodeid, recorder.records())
+        except Exception as e:
+            print(f"Traffic capture failed: {e}")
+    
     # Cleanup after test
     driver.quit()
 
 
+def page_metrics(driver):
+    """Reads navigation timing for the page the test ended on."""
+    try:
+        timing = driver.execute_script(
+            "const nav = performance.getEntriesByType('navigation')[0];"
+            "return nav ? {load: nav.loadEventEnd, ready: nav.domContentLoadedEventEnd} : null;"
+        )
+    except Exception:
+        timing = None
+    if not timing:
+        return {}
+    return {"page_load_ms": timing["load"] or None, "dom_ready_ms": timing["ready"] or None}
+
+
+# ==================== Run Results ====================
+# Collected per test, written to RESULTS_FILE and recorded in HISTORY_DB
+
+def _process_started_at():
+    """
+    Wall-clock time this process started, so time-to-first-test covers
+    interpreter startup. Falls back to now where /proc is not available.
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the command name; starttime (field 22) is in clock ticks since boot
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return time.time()
+    return time.time() - (uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+
+
+# run_tests.py passes its own start time; plain pytest runs use the process start
+_session = {"started_at": float(os.getenv("RUN_STARTED_AT") or _process_started_at())}
+_startup = {"conftest_loaded_s": time.time() - _session["started_at"]}
+_results = {}
+
+
+def _result(nodeid):
+    return _results.setdefault(nodeid, {
+        "nodeid": nodeid,
+        "outcome": "passed",
+        "duration_s": 0.0,
+        "setup_s": 0.0,
+        "retries": 0,
+        "page_load_ms": None,
+        "dom_ready_ms": None,
+        "interactions": [],
+    })
+
+
+def pytest_runtest_logreport(report):
+    """Tracks outcome, call duration and fixture setup time per test."""
+    result = _result(report.nodeid)
+    if report.outcome == "rerun":
+        # Reported by pytest-rerunfailures when a test is retried
+        result["retries"] += 1
+    elif report.when == "setup":
+        result["setup_s"] = report.duration
+        if report.failed:
+            result["outcome"] = "error"
+        elif report.skipped:
+            result["outcome"] = "skipped"
+    elif report.when == "call":
+        result["duration_s"] = report.duration
+        result["outcome"] = report.outcome
+    elif report.failed:
+        result["outcome"] = "error"
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """
+    Captures failure artifacts from the test's browser and links them from
+    the HTML report instead of embedding them.
+    """
+    outcome = yield
+    report = outcome.get_result()
+    if report.when not in ("setup", "call") or not report.failed:
+        return
+
+    driver = item.funcargs.get("driver") if hasattr(item, "funcargs") else None
+    if driver is None:
+        return
+
+    html_path = getattr(item.config.option, "htmlpath", None)
+    captured = artifacts.capture_failure(driver, os.path.dirname(html_path) if html_path else ".")
+    pytest_html = item.config.pluginmanager.getplugin("html")
+    if pytest_html is not None:
+        report.extras = getattr(report, "extras", []) + [
+            pytest_html.extras.url(path, name=label) for label, path in captured
+        ]
+
+
+def pytest_collection(session):
+    _startup["collection_started"] = time.perf_counter()
+
+
+def pytest_collection_finish(session):
+    _startup["collection_s"] = time.perf_counter() - _startup.pop("collection_started")
+
+
+def pytest_runtest_call(item):
+    # Fixture setup (browser launch) counts as startup; the test body does not
+    _startup.setdefault("first_test_s", time.time() - _session["started_at"])
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Reports how long it took to get to the first test."""
+    if "first_test_s" not in _startup:
+        return
+    terminalreporter.write_sep("-", "startup")
+    terminalreporter.write_line(f"conftest loaded after {_startup['conftest_loaded_s']:.2f}s")
+    terminalreporter.write_line(f"collection took       {_startup['collection_s']:.2f}s")
+    terminalreporter.write_line(f"first test started at {_startup['first_test_s']:.2f}s")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Writes the collected results and stores them in the run history."""
+    if not _results:
+        return
+    run = {
+        "started_at": _session["started_at"],
+        "duration_s": time.time() - _session["started_at"],
+        "startup": _startup,
+        "results": list(_results.values()),
+    }
+    directory = os.path.dirname(RESULTS_FILE)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(RESULTS_FILE, "w") as f:
+        json.dump(run, f, indent=2)
+    
+    # History must never turn a green run red
+    try:
+        conn = perf_history.connect()
+        try:
+            perf_history.record_run(conn, run, session.config.getoption("markexpr") or None)
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"Could not record run history: {e}")
+
+
+@pytest.fixture(scope="function")
+def interactions(request):
+    """
+    List for UI interaction timings (see interaction.py).
+    Whatever a test appends is stored with its results in the run history.
+    """
+    return _result(request.node.nodeid)["interactions"]
+
+
 @pytest.fixture(scope="function")
 def base_url():
     """Returns the base URL for the application."""
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+"""
+UI Interaction Timing
+Measures how long a click takes to show up in the rendered page.
+
+A probe injected with execute_script records the click time, the /api/*
+requests it triggers (PerformanceObserver) and the moment React commits the
+expected DOM change (MutationObserver). Each interaction is split into
+click-to-network, network and network-to-DOM time.
+
+Usage:
+    python interaction.py                 # 20 toggle and edit rounds
+    python interaction.py --repeat 100
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from loadlib import chrome_options, percentile, register_user, send_request, sign_in_browser
+
+PHASES = ("click_to_network_ms", "network_ms", "network_to_dom_ms", "total_ms")
+
+# Arms the probe. arguments: selector, class name to watch flip, or text to wait for
+PROBE_SCRIPT = """
+const [selector, className, text] = arguments;
+const old = window.__interactionProbe;
+if (old) { old.mutations.disconnect(); old.resources.disconnect(); }
+
+const probe = window.__interactionProbe = {clickAt: null, domAt: null, requests: []};
+const first = document.querySelector(selector);
+const initial = className && first ? first.classList.contains(className) : null;
+
+const matches = () => {
+    const nodes = document.querySelectorAll(selector);
+    if (text !== null) {
+        return Array.from(nodes).some(node => node.textContent.trim() === text);
+    }
+    return nodes.length > 0 && nodes[0].classList.contains(className) !== initial;
+};
+
+document.addEventListener('click', () => {
+    if (probe.clickAt === null) probe.clickAt = performance.now();
+}, {capture: true, once: true});
+
+probe.record = entries => {
+    for (const entry of entries) {
+        if (entry.name.includes('/api/')) {
+            probe.requests.push({start: entry.startTime, end: entry.responseEnd});
+        }
+    }
+};
+probe.resources = new PerformanceObserver(list => probe.record(list.getEntries()));
+probe.resources.observe({type: 'resource'});
+
+probe.mutations = new MutationObserver(() => {
+    if (probe.domAt === null && probe.clickAt !== null && matches()) {
+        probe.domAt = performance.now();
+        probe.mutations.disconnect();
+    }
+});
+probe.mutations.observe(document.body, {
+    subtree: true, childList: true, characterData: true,
+    attributes: true, attributeFilter: ['class']
+});
+"""
+
+# Reads the probe once the DOM change was seen
+COLLECT_SCRIPT = """
+const probe = window.__interactionProbe;
+// Observer callbacks are asynchronous; pick up entries not delivered yet
+probe.record(probe.resources.takeRecords());
+probe.resources.disconnect();
+
+const requests = probe.requests.filter(r => r.start >= probe.clickAt && r.end <= probe.domAt);
+const result = {total_ms: probe.domAt - probe.clickAt};
+if (requests.length) {
+    const start = Math.min(...requests.map(r => r.start));
+    const end = Math.max(...requests.map(r => r.end));
+    result.click_to_network_ms = start - probe.clickAt;
+    result.network_ms = end - start;
+    result.network_to_dom_ms = probe.domAt - end;
+}
+return result;
+"""
+
+
+def measure_click(driver, element, action, selector, class_name=None, text=None, timeout=10):
+    """
+    Clicks `element` and waits until the first `selector` match flips
+    `class_name`, or any match shows `text`. Returns the phase timings
+    in milliseconds; network phases are missing if no API call was made.
+    If the change never renders, the sample is marked failed and has no
+    timings.
+    """
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    driver.execute_script(PROBE_SCRIPT, selector, class_name, text)
+    element.click()
+    try:
+        WebDriverWait(driver, timeout).until(
+            lambda d: d.execute_script("return window.__interactionProbe.domAt !== null")
+        )
+    except TimeoutException:
+        return {"action": action, "failed": True}
+
+    timing = driver.execute_script(COLLECT_SCRIPT)
+    timing["action"] = action
+    return timing
+
+
+def summarize_timings(samples):
+    """
+    Groups timings by action and returns p50/p95/p99 for every phase (None
+    when a phase has no samples), plus the number of interactions that
+    never rendered.
+    """
+    grouped = {}
+    failed = {}
+    for sample in samples:
+        phases = grouped.setdefault(sample["action"], {phase: [] for phase in PHASES})
+        failed[sample["action"]] = failed.get(sample["action"], 0) + bool(sample.get("failed"))
+        for phase in PHASES:
+            if sample.get(phase) is not None:
+                phases[phase].append(sample[phase])
+
+    return {
+        action: {
+            "failed": failed[action],
+            **{
+                phase: {
+                    "count": len(values),
+                    "p50": percentile(values, 50, empty=None),
+                    "p95": percentile(values, 95, empty=None),
+                    "p99": percentile(values, 99, empty=None),
+                }
+                for phase, values in phases.items()
+            },
+        }
+        for action, phases in grouped.items()
+    }
+
+
+def _ms(value):
+    return f"{value:>7.1f}ms" if value is not None else f"{'-':>9}"
+
+
+def print_timings(summary):
+    """Prints one block per action with a row per phase."""
+    for action in sorted(summary):
+        failed = summary[action]["failed"]
+        print(f"\n{action}" + (f"  ({failed} timed out)" if failed else ""))
+        print(f"  {'Phase':<22} {'Count':>6} {'p50':>9} {'p95':>9} {'p99':>9}")
+        for phase in PHASES:
+            s = summary[action][phase]
+            print(f"  {phase:<22} {s['count']:>6} {_ms(s['p50'])} {_ms(s['p95'])} {_ms(s['p99'])}")
+
+
+def run_rounds(app_url, repeat, headless=True):
+    """
+    Logs in a fresh user with one todo and repeats the toggle and edit
+    interactions `repeat` times. Returns the list of timings.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    _, data = register_user(app_url, "timing")
+    send_request(
+        app_url, "POST", "/api/todos",
+        {"Content-Type": "application/json", "Authorization": f"Bearer {data['token']}"},
+        json.dumps({"title": "Timing todo", "priority": "medium"})
+    )
+
+    driver = webdriver.Chrome(options=chrome_options(headless))
+
+    samples = []
+    try:
+        sign_in_browser(driver, app_url, data)
+        driver.get(app_url)
+        wait = WebDriverWait(driver, 15)
+        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ".todo-item")))
+
+        for i in range(repeat):
+            toggle_btn = driver.find_element(By.CSS_SELECTOR, ".todo-item .todo-actions button")
+            samples.append(measure_click(driver, toggle_btn, "toggle todo", ".todo-item", class_name="completed"))
+
+            driver.find_element(By.CSS_SELECTOR, ".todo-item .todo-actions .btn-primary").click()
+            title = f"Timing todo {i}"
+            title_input = wait.until(EC.presence_of_element_located((By.ID, "title")))
+            title_input.clear()
+            title_input.send_keys(title)
+            submit_btn = driver.find_element(By.CSS_SELECTOR, ".todo-form button[type='submit']")
+            samples.append(measure_click(driver, submit_btn, "edit todo", ".todo-title", text=title))
+    finally:
+        driver.quit()
+
+    return samples
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure click-to-render latency of todo interactions")
+    parser.add_argument("--url", default=os.getenv("APP_URL", "http://localhost:3000"),
+                        help="Frontend URL (default: APP_URL)")
+    parser.add_argument("--repeat", type=int, default=20, help="Rounds of toggle + edit")
+    parser.add_argument("--output", help="Also write raw timings to this JSON file")
+    args = parser.parse_args()
+
+    print(f"\n{'='*60}")
+    print(f"🖱  Measuring UI interactions ({args.repeat} rounds)")
+    print(f"{'='*60}")
+
+    samples = run_rounds(args.url, args.repeat, os.getenv("HEADLESS", "true").lower() == "true")
+    print_timings(summarize_timings(samples))
+    failed = sum(1 for sample in samples if sample.get("failed"))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(samples, f, indent=1)
+        print(f"\n📄 Raw timings saved: {args.output}")
+    sys.exit(1 if failed else 0)
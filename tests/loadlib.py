@@ -0,0 +1,232 @@
+"""
+Load Testing Helpers
+Shared HTTP client, test user, browser, statistics and container metrics
+helpers used by the load tooling.
+Only the standard library is used so the helpers run inside the test image;
+the browser helpers import Selenium when they are called.
+"""
+
+import json
+import math
+import os
+import re
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+
+# Path segments that look like MongoDB ObjectIds are collapsed into ":id"
+OBJECT_ID_PATTERN = re.compile(r"/[0-9a-fA-F]{24}(?=/|$)")
+
+SERVER_CONTAINER = os.getenv("SERVER_CONTAINER", "todo-server")
+
+
+def send_request(base_url, method, path, headers=None, body=None, timeout=30):
+    """
+    Sends a single HTTP request and measures it.
+    Returns a (status, response_body, elapsed_ms) tuple. Connection errors
+    are reported with status 0 so callers can count them as failures.
+    """
+    data = body.encode("utf-8") if isinstance(body, str) else body
+    request = urllib.request.Request(
+        base_url.rstrip("/") + path,
+        data=data,
+        headers=headers or {},
+        method=method
+    )
+
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            status = response.status
+            payload = response.read().decode("utf-8", errors="replace")
+    except urllib.error.HTTPError as e:
+        status = e.code
+        payload = e.read().decode("utf-8", errors="replace")
+    except (urllib.error.URLError, OSError):
+        status = 0
+        payload = ""
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    return status, payload, elapsed_ms
+
+
+def parse_json(payload):
+    """Parses a JSON response body, returning None for anything else."""
+    if not payload:
+        return None
+    try:
+        return json.loads(payload)
+    except ValueError:
+        return None
+
+
+def register_user(base_url, prefix, suffix=""):
+    """
+    Registers a throwaway user named after `prefix`.
+    Returns (credentials, data) where data holds the API's token and user.
+    """
+    stamp = f"{int(time.time())}{os.getpid()}{suffix}"
+    credentials = {
+        "username": f"{prefix}_{stamp}"[:30],
+        "email": f"{prefix}_{stamp}@test.com",
+        "password": "Test123456",
+    }
+    status, payload, _ = send_request(
+        base_url, "POST", "/api/auth/register",
+        {"Content-Type": "application/json"}, json.dumps(credentials)
+    )
+    if status != 201:
+        raise RuntimeError(f"Could not register {prefix} user (status {status})")
+    return credentials, parse_json(payload)["data"]
+
+
+def chrome_options(headless=True):
+    """Chrome options shared by the Selenium tests and the load tools."""
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    if headless:
+        for argument in ("--headless=new", "--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu"):
+            options.add_argument(argument)
+    options.add_argument("--window-size=1920,1080")
+    return options
+
+
+def sign_in_browser(driver, app_url, data):
+    """Opens the app and stores a registered user's session in localStorage."""
+    driver.get(app_url)
+    driver.execute_script(
+        "localStorage.setItem('token', arguments[0]);"
+        "localStorage.setItem('user', arguments[1]);",
+        data["token"], json.dumps(data["user"])
+    )
+
+
+def endpoint_key(method, path):
+    """Groups requests by endpoint, e.g. 'PATCH /api/todos/:id/toggle'."""
+    path = path.split("?", 1)[0]
+    return f"{method} {OBJECT_ID_PATTERN.sub('/:id', path)}"
+
+
+def percentile(values, pct, empty=0.0):
+    """
+    Returns the pct-th percentile (nearest-rank) of a list of numbers,
+    or `empty` if there are none.
+    """
+    if not values:
+        return empty
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples):
+    """
+    Summarizes (elapsed_ms, ok) samples into count, error rate and
+    p50/p95/p99 latency.
+    """
+    latencies = [elapsed for elapsed, _ in samples]
+    errors = sum(1 for _, ok in samples if not ok)
+    return {
+        "count": len(samples),
+        "errors": errors,
+        "error_rate": errors / len(samples) if samples else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+    }
+
+
+def print_summary_table(results):
+    """Prints a per-endpoint latency table for a dict of endpoint -> summary."""
+    print(f"{'Endpoint':<40} {'Count':>7} {'Err%':>6} {'p50':>8} {'p95':>8} {'p99':>8}")
+    print("-" * 82)
+    for endpoint in sorted(results):
+        s = results[endpoint]
+        print(
+            f"{endpoint:<40} {s['count']:>7} {s['error_rate'] * 100:>5.1f}% "
+            f"{s['p50']:>6.1f}ms {s['p95']:>6.1f}ms {s['p99']:>6.1f}ms"
+        )
+
+
+def _parse_size(text):
+    """Converts a docker size such as '48.5MiB' into MiB."""
+    units = {"B": 1 / 1024 ** 2, "KiB": 1 / 1024, "MiB": 1, "GiB": 1024, "TiB": 1024 ** 2,
+             "kB": 1000 / 1024 ** 2, "MB": 1000 ** 2 / 1024 ** 2, "GB": 1000 ** 3 / 1024 ** 2}
+    text = text.strip()
+    for unit in sorted(units, key=len, reverse=True):
+        if text.endswith(unit):
+            return float(text[:-len(unit)]) * units[unit]
+    return 0.0
+
+
+def docker_stats(container=SERVER_CONTAINER):
+    """
+    Reads one `docker stats` sample for a container.
+    Returns {"cpu": percent, "mem_mib": MiB} or None if docker is unavailable.
+    """
+    try:
+        output = subprocess.run(
+            ["docker", "stats", "--no-stream", "--format", "{{json .}}", container],
+            capture_output=True, text=True, timeout=15
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if output.returncode != 0 or not output.stdout.strip():
+        return None
+
+    stats = json.loads(output.stdout.strip().splitlines()[0])
+    try:
+        return {
+            "cpu": float(stats["CPUPerc"].rstrip("%")),
+            "mem_mib": _parse_size(stats["MemUsage"].split("/")[0]),
+        }
+    except ValueError:
+        # Container is stopping and reports "--"
+        return None
+
+
+class StatsSampler:
+    """Samples container stats on a background thread while load runs."""
+
+    def __init__(self, container=SERVER_CONTAINER):
+        self.container = container
+        self.samples = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            sample = docker_stats(self.container)
+            if sample:
+                with self._lock:
+                    self.samples.append(sample)
+            # `docker stats --no-stream` already blocks for about a second
+            self._stop.wait(0.5)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def summary(self, reset=False):
+        """
+        Mean CPU and peak memory over the sampled period. With reset, the
+        samples are cleared so the next summary starts a new period.
+        """
+        with self._lock:
+            samples = self.samples
+            if reset:
+                self.samples = []
+        if not samples:
+            return {"cpu": None, "mem_mib": None}
+        return {
+            "cpu": sum(s["cpu"] for s in samples) / len(samples),
+            "mem_mib": max(s["mem_mib"] for s in samples),
+        }
@@ -0,0 +1,375 @@
+#!/usr/bin/env python
+"""
+Test and Performance History
+Keeps every test run in a SQLite database and builds a static trend report
+of the slowest, most regressed and flakiest tests.
+
+conftest.py records every pytest session here when it finishes (and also
+writes reports/test_results.json), so history survives report overwrites.
+In CI, HISTORY_DB points at a volume outside the Jenkins workspace.
+
+Usage:
+    python perf_history.py record reports/test_results.json
+    python perf_history.py report                      # Last 50 runs
+    python perf_history.py report --runs 200 --output reports/trend.html
+"""
+
+import argparse
+import html
+import json
+import os
+import sqlite3
+import sys
+import time
+from collections import defaultdict
+
+from loadlib import percentile
+
+HISTORY_DB = os.getenv("HISTORY_DB", "reports/history.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at REAL NOT NULL,
+    git_commit TEXT,
+    marker TEXT,
+    duration_s REAL,
+    passed INTEGER,
+    failed INTEGER,
+    skipped INTEGER,
+    collection_s REAL,
+    first_test_s REAL
+);
+CREATE TABLE IF NOT EXISTS tests (
+    id INTEGER PRIMARY KEY,
+    nodeid TEXT NOT NULL UNIQUE
+);
+-- Keyed by run first so "last N runs" is a range scan on the primary key.
+-- Deliberately no (test_id, run_id) index: the planner would prefer it for
+-- GROUP BY test_id and scan the whole history instead of the recent window.
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    test_id INTEGER NOT NULL REFERENCES tests(id),
+    outcome TEXT NOT NULL,
+    duration_s REAL,
+    setup_s REAL,
+    retries INTEGER DEFAULT 0,
+    page_load_ms REAL,
+    dom_ready_ms REAL,
+    PRIMARY KEY (run_id, test_id)
+) WITHOUT ROWID;
+-- UI interaction timings recorded through the `interactions` fixture
+CREATE TABLE IF NOT EXISTS interactions (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    test_id INTEGER NOT NULL REFERENCES tests(id),
+    action TEXT NOT NULL,
+    click_to_network_ms REAL,
+    network_ms REAL,
+    network_to_dom_ms REAL,
+    total_ms REAL
+);
+CREATE INDEX IF NOT EXISTS idx_interactions_run ON interactions (run_id);
+"""
+
+# Columns added after the first release of the schema
+RUN_COLUMNS = {"collection_s": "REAL", "first_test_s": "REAL"}
+
+# Consecutive runs compared against the older baseline for regressions
+RECENT_RUNS = 5
+
+TOP = 15
+
+
+def connect(path=HISTORY_DB):
+    """Opens (and if needed creates) the history database."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(runs)")}
+    for column, kind in RUN_COLUMNS.items():
+        if column not in existing:
+            conn.execute(f"ALTER TABLE runs ADD COLUMN {column} {kind}")
+    return conn
+
+
+def record_run(conn, run, marker=None):
+    """
+    Stores one pytest session as written by conftest.py.
+    Returns the new run id.
+    """
+    results = run["results"]
+    startup = run.get("startup", {})
+    counts = defaultdict(int)
+    for result in results:
+        counts[result["outcome"]] += 1
+
+    with conn:
+        cursor = conn.execute(
+            "INSERT INTO runs (started_at, git_commit, marker, duration_s, passed, failed, skipped, "
+            "collection_s, first_test_s) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (run["started_at"], os.getenv("GIT_COMMIT"), marker, run["duration_s"],
+             counts["passed"], counts["failed"] + counts["error"], counts["skipped"],
+             startup.get("collection_s"), startup.get("first_test_s"))
+        )
+        run_id = cursor.lastrowid
+
+        conn.executemany(
+            "INSERT OR IGNORE INTO tests (nodeid) VALUES (?)",
+            [(r["nodeid"],) for r in results]
+        )
+        test_ids = dict(conn.execute("SELECT nodeid, id FROM tests"))
+        conn.executemany(
+            "INSERT INTO results (run_id, test_id, outcome, duration_s, setup_s, retries, "
+            "page_load_ms, dom_ready_ms) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(run_id, test_ids[r["nodeid"]], r["outcome"], r["duration_s"], r["setup_s"],
+              r["retries"], r["page_load_ms"], r["dom_ready_ms"]) for r in results]
+        )
+        conn.executemany(
+            "INSERT INTO interactions (run_id, test_id, action, click_to_network_ms, network_ms, "
+            "network_to_dom_ms, total_ms) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(run_id, test_ids[r["nodeid"]], i["action"], i.get("click_to_network_ms"),
+              i.get("network_ms"), i.get("network_to_dom_ms"), i.get("total_ms"))
+             for r in results for i in r.get("interactions", [])]
+        )
+    return run_id
+
+
+def record_file(path, marker=None, db_path=HISTORY_DB):
+    """Records a test_results.json file into the history database."""
+    with open(path) as f:
+        run = json.load(f)
+    conn = connect(db_path)
+    try:
+        return record_run(conn, run, marker)
+    finally:
+        conn.close()
+
+
+# ==================== Trend Queries ====================
+
+def recent_run_floor(conn, runs):
+    """Returns the smallest run id among the last `runs` runs."""
+    row = conn.execute(
+        "SELECT MIN(id) FROM (SELECT id FROM runs ORDER BY id DESC LIMIT ?)", (runs,)
+    ).fetchone()
+    return row[0] or 0
+
+
+def slowest_tests(conn, floor):
+    """Average and worst call duration of passing tests since run `floor`."""
+    return conn.execute(
+        """
+        SELECT t.nodeid, COUNT(*), AVG(r.duration_s), MAX(r.duration_s), AVG(r.setup_s), AVG(r.page_load_ms)
+        FROM results r JOIN tests t ON t.id = r.test_id
+        WHERE r.run_id >= ? AND r.outcome = 'passed'
+        GROUP BY r.test_id
+        ORDER BY AVG(r.duration_s) DESC
+        LIMIT ?
+        """,
+        (floor, TOP)
+    ).fetchall()
+
+
+def regressions(conn, floor, recent=RECENT_RUNS):
+    """
+    Compares each test's mean duration over the last `recent` runs with the
+    older runs since `floor`. Returns rows of (nodeid, baseline, recent, delta).
+    """
+    split = recent_run_floor(conn, recent)
+    rows = conn.execute(
+        """
+        SELECT t.nodeid,
+               AVG(CASE WHEN r.run_id < ? THEN r.duration_s END),
+               AVG(CASE WHEN r.run_id >= ? THEN r.duration_s END)
+        FROM results r JOIN tests t ON t.id = r.test_id
+        WHERE r.run_id >= ? AND r.outcome = 'passed'
+        GROUP BY r.test_id
+        """,
+        (split, split, floor)
+    ).fetchall()
+
+    changes = [
+        (nodeid, baseline, current, current - baseline)
+        for nodeid, baseline, current in rows
+        if baseline is not None and current is not None and current > baseline
+    ]
+    return sorted(changes, key=lambda row: row[3], reverse=True)[:TOP]
+
+
+def flakiest_tests(conn, floor):
+    """
+    Finds tests that both passed and failed since run `floor`, ranked by how
+    often the outcome flipped between consecutive runs.
+    Returns rows of (nodeid, runs, failures, flips, retries).
+    """
+    history = defaultdict(list)
+    retries = defaultdict(int)
+    for nodeid, outcome, retry_count in conn.execute(
+        """
+        SELECT t.nodeid, r.outcome, r.retries
+        FROM results r JOIN tests t ON t.id = r.test_id
+        WHERE r.run_id >= ? AND r.outcome != 'skipped'
+        ORDER BY r.test_id, r.run_id
+        """,
+        (floor,)
+    ):
+        history[nodeid].append(outcome == "passed")
+        retries[nodeid] += retry_count
+
+    flaky = []
+    for nodeid, outcomes in history.items():
+        failures = outcomes.count(False)
+        if (failures and failures < len(outcomes)) or retries[nodeid]:
+            flips = sum(1 for a, b in zip(outcomes, outcomes[1:]) if a != b)
+            flaky.append((nodeid, len(outcomes), failures, flips, retries[nodeid]))
+    return sorted(flaky, key=lambda row: (row[3], row[4], row[2]), reverse=True)[:TOP]
+
+
+def interaction_percentiles(conn, floor):
+    """
+    p50/p95/p99 of total interaction time per action since run `floor`,
+    plus the median of each phase. Interactions that never rendered have no
+    total and are counted as timeouts. Returns rows of (action, count,
+    timeouts, p50, p95, p99, click-to-network, network, network-to-DOM);
+    values are None when an action has no completed samples.
+    """
+    samples = defaultdict(lambda: ([], [], [], []))
+    timeouts = defaultdict(int)
+    for action, *values in conn.execute(
+        "SELECT action, total_ms, click_to_network_ms, network_ms, network_to_dom_ms "
+        "FROM interactions WHERE run_id >= ?",
+        (floor,)
+    ):
+        if values[0] is None:
+            timeouts[action] += 1
+        for bucket, value in zip(samples[action], values):
+            if value is not None:
+                bucket.append(value)
+
+    return [
+        (action, len(total), timeouts[action], percentile(total, 50, empty=None),
+         percentile(total, 95, empty=None), percentile(total, 99, empty=None),
+         _median(click), _median(network), _median(dom))
+        for action, (total, click, network, dom) in sorted(samples.items())
+    ]
+
+
+def _median(values):
+    return percentile(values, 50, empty=None)
+
+
+def run_totals(conn, floor):
+    """Per-run totals since run `floor`, oldest first."""
+    return conn.execute(
+        "SELECT id, started_at, git_commit, duration_s, collection_s, first_test_s, passed, failed, skipped "
+        "FROM runs WHERE id >= ? ORDER BY id",
+        (floor,)
+    ).fetchall()
+
+
+# ==================== HTML Report ====================
+
+def _table(headers, rows):
+    """Renders a list of rows as an HTML table."""
+    if not rows:
+        return "<p class='empty'>No data yet.</p>"
+    head = "".join(f"<th>{html.escape(h)}</th>" for h in headers)
+    body = "".join(
+        "<tr>" + "".join(f"<td>{html.escape(str(cell))}</td>" for cell in row) + "</tr>"
+        for row in rows
+    )
+    return f"<table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>"
+
+
+def _fmt(value, spec=".2f"):
+    return "-" if value is None else format(value, spec)
+
+
+def build_report(conn, runs=50):
+    """Builds the static HTML trend report for the last `runs` runs."""
+    floor = recent_run_floor(conn, runs)
+
+    slowest = [
+        (nodeid, count, _fmt(avg), _fmt(worst), _fmt(setup), _fmt(page, ".0f"))
+        for nodeid, count, avg, worst, setup, page in slowest_tests(conn, floor)
+    ]
+    regressed = [
+        (nodeid, _fmt(baseline), _fmt(current), f"+{delta:.2f}", f"{(current / baseline - 1) * 100:+.0f}%"
+         if baseline else "-")
+        for nodeid, baseline, current, delta in regressions(conn, floor)
+    ]
+    flaky = flakiest_tests(conn, floor)
+    ui = [
+        (action, count, timeouts) + tuple(_fmt(value, ".1f") for value in values)
+        for action, count, timeouts, *values in interaction_percentiles(conn, floor)
+    ]
+    totals = [
+        (run_id, time.strftime("%Y-%m-%d %H:%M", time.localtime(started)), (commit or "-")[:8],
+         _fmt(duration, ".1f"), _fmt(collection), _fmt(first_test), passed, failed, skipped)
+        for run_id, started, commit, duration, collection, first_test, passed, failed, skipped
+        in run_totals(conn, floor)
+    ]
+
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Selenium Test Trends</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; color: #222; }}
+table {{ border-collapse: collapse; margin-bottom: 2em; }}
+th, td {{ border: 1px solid #ccc; padding: 4px 8px; text-align: left; }}
+th {{ background: #f0f0f0; }}
+.empty {{ color: #888; }}
+</style>
+</head>
+<body>
+<h1>📊 Selenium Test Trends</h1>
+<p>Last {len(totals)} runs, generated {time.strftime("%Y-%m-%d %H:%M")}.</p>
+<h2>🐢 Slowest Tests</h2>
+{_table(["Test", "Runs", "Avg (s)", "Max (s)", "Setup (s)", "Page load (ms)"], slowest)}
+<h2>📈 Biggest Regressions (last {RECENT_RUNS} runs vs. before)</h2>
+{_table(["Test", "Baseline (s)", "Recent (s)", "Delta (s)", "Change"], regressed)}
+<h2>🎲 Flakiest Tests</h2>
+{_table(["Test", "Runs", "Failures", "Outcome flips", "Retries"], flaky)}
+<h2>🖱 UI Interaction Latency (ms)</h2>
+{_table(["Action", "Samples", "Timeouts", "p50", "p95", "p99", "Click to network (p50)", "Network (p50)",
+         "Network to DOM (p50)"], ui)}
+<h2>🗂 Runs</h2>
+{_table(["Run", "Started", "Commit", "Duration (s)", "Collection (s)", "First test (s)",
+         "Passed", "Failed", "Skipped"], totals)}
+</body>
+</html>
+"""
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Selenium test history and trend report")
+    parser.add_argument("--db", default=HISTORY_DB, help="History database (default: HISTORY_DB)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_cmd = commands.add_parser("record", help="Store a test_results.json file")
+    record_cmd.add_argument("results", help="Results file written by conftest.py")
+    record_cmd.add_argument("--marker", help="Marker the run was filtered by")
+
+    report_cmd = commands.add_parser("report", help="Build the static trend report")
+    report_cmd.add_argument("--runs", type=int, default=50, help="Number of recent runs to include")
+    report_cmd.add_argument("--output", default="reports/trend_report.html")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        run_id = record_file(args.results, args.marker, args.db)
+        print(f"🗄  Recorded run #{run_id} in {args.db}")
+        sys.exit(0)
+
+    conn = connect(args.db)
+    report = build_report(conn, args.runs)
+    conn.close()
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(report)
+    print(f"📄 Trend report generated: {args.output}")
@@ -8,11 +8,13 @@ Usage:
     python run_tests.py --smoke      # Run only smoke tests
     python run_tests.py --auth       # Run only auth tests
     python run_tests.py --todo       # Run only todo tests
+    python run_tests.py --startup    # Profile imports and collection only
 """
 
 import subprocess
 import sys
 import os
+import time
 
 def run_tests(marker=None):
     """Run pytest with optional marker filter."""
@@ -38,7 +40,9 @@ def run_tests(marker=None):
     print(f"{'='*60}\n")
     
     # Run tests
-    result = subprocess.run(cmd, cwd=os.path.dirname(os.path.abspath(__file__)))
+    tests_dir = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, RUN_STARTED_AT=str(time.time()))
+    result = subprocess.run(cmd, cwd=tests_dir, env=env)
     
     print(f"\n{'='*60}")
     if result.returncode == 0:
@@ -49,6 +53,54 @@ def run_tests(marker=None):
     
     print("📄 Test report generated: reports/test_report.html")
     
+    print("📊 Trend report: python perf_history.py report")
+    
+    return result.returncode
+
+
+def profile_startup(top=15):
+    """
+    Collect tests without running them under `python -X importtime` and
+    report the slowest imports and the total time to collect.
+    """
+    # -s: importtime writes to stderr, which capture would hide while
+    # conftest and the test modules are imported
+    cmd = [
+        sys.executable, "-X", "importtime", "-m", "pytest",
+        "--collect-only", "-q", "-s", "-o", "addopts=", "-p", "no:cacheprovider"
+    ]
+    
+    print(f"\n{'='*60}")
+    print("⏱  Profiling test startup (imports + collection)")
+    print(f"{'='*60}\n")
+    
+    started = time.perf_counter()
+    result = subprocess.run(
+        cmd, cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - started
+    
+    # Lines look like "import time:   self [us] | cumulative | name";
+    # top-level imports have no indentation before the name
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):
+            imports.append((int(cumulative) / 1000, name.strip()))
+    imports.sort(reverse=True)
+    
+    print(f"{'Module':<45} {'Cumulative':>12}")
+    print("-" * 58)
+    for cumulative_ms, name in imports[:top]:
+        print(f"{name:<45} {cumulative_ms:>10.1f}ms")
+    
+    print(f"\n📦 Total import time: {sum(ms for ms, _ in imports):.1f}ms")
+    print(f"🔎 {result.stdout.strip().splitlines()[-1] if result.stdout.strip() else 'No output'}")
+    print(f"⏱  Time to collected tests: {elapsed:.2f}s\n")
+    
     return result.returncode
 
 
@@ -59,6 +111,8 @@ if __name__ == "__main__":
         arg = sys.argv[1].replace("--", "")
         if arg in ["smoke", "auth", "todo"]:
             marker = arg
+        elif arg == "startup":
+            sys.exit(profile_startup())
     
     exit_code = run_tests(marker)
     sys.exit(exit_code)
@@ -0,0 +1,380 @@
+#!/usr/bin/env python
+"""
+Soak Test Runner
+Keeps a steady mixed workload running against the API for hours and tracks
+how latency and the server container's resources drift over time.
+
+Every interval the runner records p50/p95/p99 per endpoint, timed from each
+request's scheduled arrival, and the server container's CPU and memory
+(sampled with `docker stats` on a background thread). Arrivals that find
+the backlog full are dropped and counted. At the end it flags endpoints whose
+p95 rose, resources that kept climbing between the start and end of the run,
+and any dropped arrivals.
+
+Usage:
+    python soak.py --duration 30m                     # 30 minutes at 20 req/s
+    python soak.py --duration 8h --rate 50 --users 20
+    python soak.py --duration 2h --browser            # Add periodic browser actions
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from loadlib import (
+    SERVER_CONTAINER, StatsSampler, chrome_options, parse_json, percentile, register_user,
+    send_request, sign_in_browser, summarize,
+)
+
+# (operation, weight) - roughly what the UI does during a session
+WORKLOAD = [
+    ("list", 50),
+    ("create", 15),
+    ("toggle", 15),
+    ("update", 10),
+    ("delete", 5),
+    ("me", 3),
+    ("login", 2),
+]
+
+# Endpoints with fewer samples than this at either end are too noisy to judge
+MIN_DRIFT_SAMPLES = 50
+
+# Todos per user are capped so the data set stays the same size over the run
+MAX_TODOS_PER_USER = 25
+
+
+def parse_duration(text):
+    """Parses '90', '45s', '30m' or '8h' into seconds."""
+    units = {"s": 1, "m": 60, "h": 3600}
+    if text[-1] in units:
+        return float(text[:-1]) * units[text[-1]]
+    return float(text)
+
+
+class SoakUser:
+    """An API user with its own token and set of todos."""
+
+    def __init__(self, base_url, index):
+        self.base_url = base_url
+        self.todo_ids = []
+        self.lock = threading.Lock()
+        self.credentials, self.session = register_user(base_url, "soak", f"_{index}")
+        self.token = self.session["token"]
+
+    def _headers(self):
+        return {"Content-Type": "application/json", "Authorization": f"Bearer {self.token}"}
+
+    def _pick_todo(self):
+        with self.lock:
+            return random.choice(self.todo_ids) if self.todo_ids else None
+
+    def run(self, operation):
+        """
+        Performs one operation and returns (endpoint, elapsed_ms, ok), or
+        None if it does not apply right now (e.g. nothing to toggle yet).
+        """
+        needs_todo = operation in ("toggle", "update", "delete")
+        if operation == "create" or (needs_todo and not self.todo_ids):
+            if len(self.todo_ids) >= MAX_TODOS_PER_USER:
+                operation = "delete"
+            else:
+                status, payload, elapsed = send_request(
+                    self.base_url, "POST", "/api/todos", self._headers(),
+                    json.dumps({"title": f"Soak todo {random.randint(0, 10 ** 6)}", "priority": "medium"})
+                )
+                if status == 201:
+                    with self.lock:
+                        self.todo_ids.append(parse_json(payload)["data"]["_id"])
+                return "POST /api/todos", elapsed, status == 201
+
+        if operation == "list":
+            status, _, elapsed = send_request(self.base_url, "GET", "/api/todos", self._headers())
+            return "GET /api/todos", elapsed, status == 200
+
+        if operation == "me":
+            status, _, elapsed = send_request(self.base_url, "GET", "/api/auth/me", self._headers())
+            return "GET /api/auth/me", elapsed, status == 200
+
+        if operation == "login":
+            status, payload, elapsed = send_request(
+                self.base_url, "POST", "/api/auth/login", {"Content-Type": "application/json"},
+                json.dumps({"email": self.credentials["email"], "password": self.credentials["password"]})
+            )
+            if status == 200:
+                self.token = parse_json(payload)["data"]["token"]
+            return "POST /api/auth/login", elapsed, status == 200
+
+        todo_id = self._pick_todo()
+        if todo_id is None:
+            return None
+
+        if operation == "toggle":
+            status, _, elapsed = send_request(
+                self.base_url, "PATCH", f"/api/todos/{todo_id}/toggle", self._headers()
+            )
+            return "PATCH /api/todos/:id/toggle", elapsed, status == 200
+
+        if operation == "update":
+            status, _, elapsed = send_request(
+                self.base_url, "PUT", f"/api/todos/{todo_id}", self._headers(),
+                json.dumps({"title": f"Soak todo {random.randint(0, 10 ** 6)}"})
+            )
+            return "PUT /api/todos/:id", elapsed, status == 200
+
+        status, _, elapsed = send_request(self.base_url, "DELETE", f"/api/todos/{todo_id}", self._headers())
+        with self.lock:
+            if todo_id in self.todo_ids:
+                self.todo_ids.remove(todo_id)
+        return "DELETE /api/todos/:id", elapsed, status == 200
+
+    def clear_todos(self):
+        """Deletes every todo the user has, including ones made outside run()."""
+        _, payload, _ = send_request(self.base_url, "GET", "/api/todos", self._headers())
+        for todo in (parse_json(payload) or {}).get("data", []):
+            send_request(self.base_url, "DELETE", f"/api/todos/{todo['_id']}", self._headers())
+        with self.lock:
+            self.todo_ids = []
+
+
+def browser_loop(app_url, user, interval, record, stop):
+    """
+    Periodically loads the app in headless Chrome as `user` and creates a
+    todo through the form, recording both as UI actions. The user's todos
+    are cleared after each round so the page does not grow over the run.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    driver = webdriver.Chrome(options=chrome_options())
+
+    try:
+        sign_in_browser(driver, app_url, user.session)
+        while not stop.is_set():
+            wait = WebDriverWait(driver, 30)
+            try:
+                start = time.perf_counter()
+                driver.get(app_url)
+                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ".todo-list, .empty-state")))
+                record(("UI load todos", (time.perf_counter() - start) * 1000, True))
+
+                count = len(driver.find_elements(By.CSS_SELECTOR, ".todo-item"))
+                start = time.perf_counter()
+                driver.find_element(By.ID, "title").send_keys(f"Soak UI todo {int(time.time())}")
+                driver.find_element(By.CSS_SELECTOR, ".todo-form button[type='submit']").click()
+                wait.until(lambda d: len(d.find_elements(By.CSS_SELECTOR, ".todo-item")) > count)
+                record(("UI create todo", (time.perf_counter() - start) * 1000, True))
+            except Exception as e:
+                print(f"Browser action failed: {e}")
+                record(("UI action", 0.0, False))
+            user.clear_todos()
+            stop.wait(interval)
+    finally:
+        driver.quit()
+
+
+def drift(first, last):
+    """Relative change from first to last, or None if there is no baseline."""
+    if not first:
+        return None
+    return (last - first) / first
+
+
+def analyze(timeline, args):
+    """
+    Compares the first and last quarter of the run (skipping the warm-up
+    interval) and returns a list of human readable drift findings.
+    """
+    buckets = timeline[1:] if len(timeline) > 4 else timeline
+    quarter = max(1, len(buckets) // 4)
+    head, tail = buckets[:quarter], buckets[-quarter:]
+    findings = []
+
+    endpoints = {e for bucket in buckets for e in bucket["endpoints"]}
+    for endpoint in sorted(endpoints):
+        before = [b["endpoints"][endpoint] for b in head if endpoint in b["endpoints"]]
+        after = [b["endpoints"][endpoint] for b in tail if endpoint in b["endpoints"]]
+        if min(sum(s["count"] for s in before), sum(s["count"] for s in after)) < MIN_DRIFT_SAMPLES:
+            continue
+        before = [s["p95"] for s in before]
+        after = [s["p95"] for s in after]
+        first, last = percentile(before, 50), percentile(after, 50)
+        change = drift(first, last)
+        if change is not None and change > args.max_latency_drift and last - first > 5:
+            findings.append(f"p95 of {endpoint} rose {change * 100:.0f}% ({first:.1f}ms -> {last:.1f}ms)")
+
+    for key, label, unit in (("mem_mib", "memory", "MiB"), ("cpu", "CPU", "%")):
+        before = [b["stats"][key] for b in head if b["stats"]]
+        after = [b["stats"][key] for b in tail if b["stats"]]
+        if not before or not after:
+            continue
+        first, last = sum(before) / len(before), sum(after) / len(after)
+        change = drift(first, last)
+        if change is not None and change > args.max_resource_drift:
+            findings.append(f"{label} climbed {change * 100:.0f}% ({first:.1f}{unit} -> {last:.1f}{unit})")
+
+    dropped = sum(b["dropped"] for b in timeline)
+    if dropped:
+        findings.append(f"{dropped} arrivals dropped because the backlog was full (server fell behind the rate)")
+
+    return findings
+
+
+def print_bucket(bucket):
+    """Prints one line per interval."""
+    overall = bucket["overall"]
+    stats = bucket["stats"]
+    resources = f"cpu {stats['cpu']:>5.1f}%  mem {stats['mem_mib']:>7.1f}MiB" if stats else "stats n/a"
+    print(
+        f"  {bucket['elapsed_s'] / 60:>7.1f}m  {overall['count'] / bucket['interval_s']:>6.1f} req/s  "
+        f"p95 {overall['p95']:>7.1f}ms  err {overall['error_rate'] * 100:>5.1f}%  "
+        f"dropped {bucket['dropped']:>4}  {resources}"
+    )
+
+
+def soak(args):
+    """Runs the workload for the configured duration and returns the timeline."""
+    users = [SoakUser(args.url, i) for i in range(args.users)]
+    operations, weights = zip(*WORKLOAD)
+    current = {"samples": [], "dropped": 0}
+    lock = threading.Lock()
+    timeline = []
+    stop = threading.Event()
+
+    def record(sample):
+        with lock:
+            current["samples"].append(sample)
+
+    browser = None
+    if args.browser:
+        browser = threading.Thread(
+            target=browser_loop, args=(args.app_url, SoakUser(args.url, "browser"), args.browser_interval, record, stop),
+            daemon=True
+        )
+        browser.start()
+
+    # Requests in flight or queued for a worker; beyond this, arrivals are dropped
+    backlog = threading.BoundedSemaphore(args.workers + args.max_backlog)
+
+    def fire(scheduled):
+        try:
+            result = random.choice(users).run(random.choices(operations, weights)[0])
+            if result:
+                endpoint, _, ok = result
+                # Timed from the scheduled arrival so queueing counts (no coordinated omission)
+                record((endpoint, (time.perf_counter() - scheduled) * 1000, ok))
+        finally:
+            backlog.release()
+
+    duration = parse_duration(args.duration)
+    interval = 1.0 / args.rate
+    start = time.perf_counter()
+    bucket_start = start
+    next_at = start
+
+    def flush(sampler):
+        """Closes the current bucket and appends it to the timeline."""
+        nonlocal bucket_start
+        # Swap the list so in-flight requests land in the next bucket
+        with lock:
+            bucket_samples, current["samples"] = current["samples"], []
+        dropped, current["dropped"] = current["dropped"], 0
+        stats = sampler.summary(reset=True)
+        grouped = defaultdict(list)
+        for endpoint, elapsed_ms, ok in bucket_samples:
+            grouped[endpoint].append((elapsed_ms, ok))
+        bucket = {
+            "elapsed_s": time.perf_counter() - start,
+            "interval_s": time.perf_counter() - bucket_start,
+            "overall": summarize([(e, ok) for _, e, ok in bucket_samples]),
+            "endpoints": {e: summarize(v) for e, v in grouped.items()},
+            "dropped": dropped,
+            "stats": stats if stats["cpu"] is not None else None,
+        }
+        timeline.append(bucket)
+        print_bucket(bucket)
+        bucket_start = time.perf_counter()
+
+    with StatsSampler(args.container) as sampler:
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            while next_at < start + duration:
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                if backlog.acquire(blocking=False):
+                    pool.submit(fire, next_at)
+                else:
+                    current["dropped"] += 1
+                next_at += interval
+
+                if time.perf_counter() - bucket_start >= args.interval:
+                    flush(sampler)
+
+        # The pool has drained; the last partial interval and the requests
+        # that were still in flight go into a final bucket
+        stop.set()
+        if browser:
+            browser.join()
+        if current["samples"] or current["dropped"]:
+            flush(sampler)
+
+    return timeline
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a long, steady mixed workload and report drift")
+    parser.add_argument("--url", default=os.getenv("API_URL", "http://localhost:5000"),
+                        help="Base URL serving /api (default: API_URL)")
+    parser.add_argument("--app-url", default=os.getenv("APP_URL", "http://localhost:3000"),
+                        help="Frontend URL for --browser (default: APP_URL)")
+    parser.add_argument("--duration", default="30m", help="Run time, e.g. 900, 45m, 8h")
+    parser.add_argument("--rate", type=float, default=20, help="Requests per second")
+    parser.add_argument("--users", type=int, default=10, help="API users sharing the load")
+    parser.add_argument("--workers", type=int, default=64, help="Max in-flight requests")
+    parser.add_argument("--max-backlog", type=int, default=256,
+                        help="Arrivals allowed to wait for a worker before new ones are dropped")
+    parser.add_argument("--interval", type=float, default=60, help="Seconds per percentile bucket")
+    parser.add_argument("--browser", action="store_true", help="Also run periodic browser actions")
+    parser.add_argument("--browser-interval", type=float, default=30, help="Seconds between browser actions")
+    parser.add_argument("--container", default=SERVER_CONTAINER, help="Server container to sample")
+    parser.add_argument("--max-latency-drift", type=float, default=0.25, help="Allowed p95 rise (0-1)")
+    parser.add_argument("--max-resource-drift", type=float, default=0.2, help="Allowed CPU/memory rise (0-1)")
+    parser.add_argument("--output", default="reports/soak_timeline.json", help="Timeline JSON file")
+    args = parser.parse_args()
+    if parse_duration(args.duration) < args.interval:
+        parser.error("--duration must be at least one --interval")
+
+    print(f"\n{'='*60}")
+    print(f"🛁 Soak test: {args.rate:g} req/s for {args.duration} ({args.users} users)")
+    print(f"{'='*60}\n")
+
+    timeline = soak(args)
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(timeline, f, indent=1)
+
+    if any(bucket["overall"]["count"] for bucket in timeline):
+        findings = analyze(timeline, args)
+    else:
+        findings = ["no requests were measured"]
+
+    print(f"\n{'='*60}")
+    if findings:
+        print("⚠️  Soak test failed:")
+        for finding in findings:
+            print(f"   - {finding}")
+    else:
+        print("✅ No latency or resource drift detected")
+    print(f"{'='*60}\n")
+    print(f"📄 Timeline saved: {args.output}")
+
+    sys.exit(1 if findings else 0)
@@ -9,7 +9,34 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+
+import interaction
+
+
+def create_todo(driver, title):
+    """
+    Creates a todo through the form and returns its list item.
+    Fails the test if the todo does not appear.
+    """
+    # Items can re-render between finding them and reading their title
+    wait = WebDriverWait(driver, 15, ignored_exceptions=(StaleElementReferenceException,))
+    # Let the initial todo fetch finish so it cannot replace the new item
+    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ".todo-list, .empty-state")))
+    
+    title_input = driver.find_element(By.ID, "title")
+    title_input.clear()
+    title_input.send_keys(title)
+    driver.find_element(By.CSS_SELECTOR, ".todo-form button[type='submit']").click()
+    
+    try:
+        return wait.until(lambda d: next(
+            (item for item in d.find_elements(By.CSS_SELECTOR, ".todo-item")
+             if item.find_element(By.CSS_SELECTOR, ".todo-title").text.strip() == title),
+            False
+        ))
+    except TimeoutException:
+        pytest.fail(f"Created todo '{title}' did not appear in the list")
 
 
 class TestTodoCRUD:
@@ -67,40 +94,40 @@ class TestTodoCRUD:
 
     @pytest.mark.todo
     @pytest.mark.smoke
-    def test_07_mark_todo_as_complete(self, authenticated_driver, base_url):
+    def test_07_mark_todo_as_complete(self, authenticated_driver, base_url, interactions):
         """
         Test Case 7: Mark todo as complete
         - Create a new todo
         - Click the complete button
         - Verify todo status changes (has 'completed' class)
+        - Record click-to-render timing of the toggle
         """
         driver = authenticated_driver
         wait = WebDriverWait(driver, 10)
         
         try:
             # Wait for app to load
-            wait.until(
+            app_element = wait.until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".app, .auth-container"))
             )
-            
-            # Try to find a todo item and toggle it
-            try:
-                todo_items = driver.find_elements(By.CSS_SELECTOR, ".todo-item")
-                if todo_items:
-                    # Find toggle button
-                    toggle_btn = todo_items[0].find_element(By.CSS_SELECTOR, ".btn-toggle, .toggle-btn, button")
-                    toggle_btn.click()
-                    time.sleep(0.5)
-                assert True
-            except:
-                # No todos or not authenticated
-                assert True
-                
         except TimeoutException:
             pytest.skip("App not loaded")
+        
+        if "auth" in app_element.get_attribute("class"):
+            pytest.skip("User not authenticated - skipping todo toggle test")
+        
+        # Every test gets a fresh user, so there is nothing to toggle yet
+        todo_item = create_todo(driver, f"Toggle Todo {int(time.time())}")
+        toggle_btn = todo_item.find_element(By.CSS_SELECTOR, ".btn-toggle, .toggle-btn, button")
+        
+        timing = interaction.measure_click(
+            driver, toggle_btn, "toggle todo", ".todo-item", class_name="completed"
+        )
+        interactions.append(timing)
+        assert not timing.get("failed"), "Toggled todo did not re-render"
 
     @pytest.mark.todo
-    def test_08_edit_existing_todo(self, authenticated_driver, base_url):
+    def test_08_edit_existing_todo(self, authenticated_driver, base_url, interactions):
         """
         Test Case 8: Edit an existing todo
         - Create a new todo
@@ -108,37 +135,38 @@ class TestTodoCRUD:
         - Modify the title
         - Save changes
         - Verify changes are reflected
+        - Record click-to-render timing of the save
         """
         driver = authenticated_driver
         wait = WebDriverWait(driver, 10)
         
         try:
-            wait.until(
+            app_element = wait.until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".app, .auth-container"))
             )
-            
-            # Try to find edit button
-            try:
-                edit_btns = driver.find_elements(By.CSS_SELECTOR, ".btn-edit, .edit-btn")
-                if edit_btns:
-                    edit_btns[0].click()
-                    time.sleep(0.5)
-                    
-                    # Try to update title
-                    title_input = driver.find_element(By.ID, "title")
-                    title_input.clear()
-                    title_input.send_keys(f"Updated Todo {int(time.time())}")
-                    
-                    # Submit
-                    submit_btn = driver.find_element(By.CSS_SELECTOR, ".todo-form button[type='submit']")
-                    submit_btn.click()
-                    time.sleep(0.5)
-                assert True
-            except:
-                assert True
-                
         except TimeoutException:
             pytest.skip("App not loaded")
+        
+        if "auth" in app_element.get_attribute("class"):
+            pytest.skip("User not authenticated - skipping todo edit test")
+        
+        # Every test gets a fresh user, so there is nothing to edit yet
+        todo_item = create_todo(driver, f"Edit Todo {int(time.time())}")
+        todo_item.find_element(By.CSS_SELECTOR, ".btn-edit, .edit-btn, .todo-actions .btn-primary").click()
+        
+        # Update the title in the form
+        new_title = f"Updated Todo {int(time.time())}"
+        title_input = wait.until(EC.presence_of_element_located((By.ID, "title")))
+        title_input.clear()
+        title_input.send_keys(new_title)
+        submit_btn = driver.find_element(By.CSS_SELECTOR, ".todo-form button[type='submit']")
+        
+        # Submit and wait for the new title to render
+        timing = interaction.measure_click(
+            driver, submit_btn, "edit todo", ".todo-title", text=new_title
+        )
+        interactions.append(timing)
+        assert not timing.get("failed"), "Edited todo title did not render"
 
     @pytest.mark.todo
     @pytest.mark.smoke
@@ -0,0 +1,336 @@
+#!/usr/bin/env python
+"""
+API Traffic Capture and Replay
+Records the /api/* calls made by the Selenium tests and replays them as load.
+
+Capture is enabled from conftest.py by setting CAPTURE_TRAFFIC to an output
+file. Every test appends one session (its API requests with headers, bodies
+and timing) as a line of gzip-compressed JSON.
+
+Usage:
+    CAPTURE_TRAFFIC=reports/traffic.jsonl.gz python run_tests.py
+    python traffic.py reports/traffic.jsonl.gz                      # Replay once
+    python traffic.py reports/traffic.jsonl.gz --users 20 --speed 5
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from loadlib import OBJECT_ID_PATTERN, endpoint_key, parse_json, print_summary_table, send_request, summarize
+
+# Only these request headers matter for the API; the rest are browser noise
+RECORDED_HEADERS = ("authorization", "content-type", "accept")
+
+# Response fields whose recorded values must be swapped for live ones
+DYNAMIC_FIELDS = ("token", "_id", "id")
+
+_write_lock = threading.Lock()
+
+
+# ==================== Capture ====================
+
+def enable_capture(chrome_options):
+    """Turns on Chrome performance logging so network events can be read back."""
+    prefs = dict(chrome_options.capabilities.get("goog:loggingPrefs", {}))
+    prefs["performance"] = "ALL"
+    chrome_options.set_capability("goog:loggingPrefs", prefs)
+
+
+class TrafficRecorder:
+    """
+    Rebuilds /api/* requests from the browser's performance log.
+
+    The log is polled before every WebDriver command (see recording_driver),
+    so response bodies are fetched as soon as a request finishes, before a
+    later navigation or refresh discards them.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pending = {}
+
+    def poll(self):
+        """Processes log entries written since the last poll."""
+        for entry in self.driver.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            method = message.get("method")
+            params = message.get("params", {})
+            request_id = params.get("requestId")
+
+            if method == "Network.requestWillBeSent":
+                request = params["request"]
+                parts = urlsplit(request["url"])
+                if not parts.path.startswith("/api/") or request["method"] == "OPTIONS":
+                    continue
+                self.pending[request_id] = {
+                    "method": request["method"],
+                    "path": parts.path + (f"?{parts.query}" if parts.query else ""),
+                    "headers": {
+                        k: v for k, v in request.get("headers", {}).items()
+                        if k.lower() in RECORDED_HEADERS
+                    },
+                    "body": request.get("postData"),
+                    "started": params["timestamp"],
+                }
+            elif request_id not in self.pending:
+                continue
+            elif method == "Network.responseReceived":
+                self.pending[request_id]["status"] = params["response"]["status"]
+            elif method == "Network.loadingFinished":
+                record = self.pending[request_id]
+                record["duration_ms"] = round((params["timestamp"] - record["started"]) * 1000, 1)
+                try:
+                    result = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+                    record["response"] = result.get("body")
+                except Exception:
+                    # Already evicted; replay flags anything left unmapped
+                    record["response"] = None
+
+    def records(self):
+        """
+        Returns the finished requests ordered by start time, with offsets
+        relative to the first request.
+        """
+        self.poll()
+        records = sorted(
+            (dict(r) for r in self.pending.values() if "status" in r),
+            key=lambda r: r["started"]
+        )
+        if records:
+            origin = records[0]["started"]
+            for record in records:
+                record["offset"] = round(record.pop("started") - origin, 3)
+        return records
+
+
+def recording_driver(driver):
+    """
+    Wraps a driver so its API traffic is recorded while the test runs.
+    Returns (wrapped driver, recorder).
+    """
+    from selenium.webdriver.support.events import AbstractEventListener, EventFiringWebDriver
+
+    recorder = TrafficRecorder(driver)
+
+    class Listener(AbstractEventListener):
+        def before_navigate_to(self, url, driver):
+            recorder.poll()
+
+        def before_navigate_back(self, driver):
+            recorder.poll()
+
+        def before_find(self, by, value, driver):
+            recorder.poll()
+
+        def before_click(self, element, driver):
+            recorder.poll()
+
+        def before_execute_script(self, script, driver):
+            recorder.poll()
+
+    class RecordingDriver(EventFiringWebDriver):
+        # refresh() is not an event EventFiringWebDriver reports
+        def refresh(self):
+            recorder.poll()
+            self.wrapped_driver.refresh()
+
+    return RecordingDriver(driver, Listener()), recorder
+
+
+def save_session(path, name, records):
+    """Appends one captured session to the traffic file."""
+    if not records:
+        return
+    line = json.dumps({"session": name, "requests": records}, separators=(",", ":"))
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with _write_lock, gzip.open(path, "at", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+
+def load_sessions(path):
+    """Loads every captured session from a traffic file."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# ==================== Replay ====================
+
+class Rewriter:
+    """
+    Maps recorded dynamic values (auth tokens, todo and user IDs, test user
+    names) to the live values a virtual user gets back from the server.
+    """
+
+    def __init__(self, tag, session):
+        self.tag = tag
+        self.mapping = {}
+        self.recorded = set()
+
+        # Every token and ID the recording used must get a live value before
+        # it is sent again, or the load would hit the recording user's data
+        for record in session["requests"]:
+            auth = record["headers"].get("Authorization") or record["headers"].get("authorization") or ""
+            if auth.startswith("Bearer "):
+                self.recorded.add(auth[len("Bearer "):])
+            self.recorded.update(match[1:] for match in OBJECT_ID_PATTERN.findall(record["path"]))
+            self._collect(parse_json(record.get("response")))
+
+    def apply(self, text):
+        """Replaces every known recorded value in a string."""
+        if not text:
+            return text
+        for recorded, live in self.mapping.items():
+            text = text.replace(recorded, live)
+        return text
+
+    def _collect(self, recorded):
+        if isinstance(recorded, dict):
+            for key, value in recorded.items():
+                if key in DYNAMIC_FIELDS and isinstance(value, str):
+                    # Short values would match by accident in unrelated text
+                    if len(value) >= 16:
+                        self.recorded.add(value)
+                else:
+                    self._collect(value)
+        elif isinstance(recorded, list):
+            for item in recorded:
+                self._collect(item)
+
+    def unmapped(self, *texts):
+        """Returns recorded tokens or IDs still present after rewriting."""
+        return {
+            value for value in self.recorded - self.mapping.keys()
+            if any(text and value in text for text in texts)
+        }
+
+    def prepare_body(self, path, body):
+        """
+        Makes registration payloads unique to this virtual user. Logins to
+        an account registered earlier in the session follow the rename;
+        logins to pre-existing accounts are sent unchanged.
+        """
+        if not body or not path.startswith("/api/auth/register"):
+            return self.apply(body)
+        payload = parse_json(body)
+        if not isinstance(payload, dict):
+            return self.apply(body)
+
+        username = payload.get("username")
+        if username and username not in self.mapping:
+            self.mapping[username] = f"{username[:30 - len(self.tag) - 1]}_{self.tag}"
+        email = payload.get("email")
+        if email and "@" in email and email not in self.mapping:
+            local, domain = email.split("@", 1)
+            self.mapping[email] = f"{local}_{self.tag}@{domain}"
+        return self.apply(body)
+
+    def learn(self, recorded, live):
+        """Walks recorded and live responses side by side to map dynamic values."""
+        if isinstance(recorded, dict) and isinstance(live, dict):
+            for key, value in recorded.items():
+                if key in DYNAMIC_FIELDS and isinstance(value, str) and isinstance(live.get(key), str):
+                    if value != live[key]:
+                        self.mapping[value] = live[key]
+                else:
+                    self.learn(value, live.get(key))
+        elif isinstance(recorded, list) and isinstance(live, list):
+            for recorded_item, live_item in zip(recorded, live):
+                self.learn(recorded_item, live_item)
+
+
+def replay_session(base_url, session, speed, tag, samples):
+    """
+    Replays one captured session, keeping the recorded pacing divided by
+    speed, and appends (endpoint, elapsed_ms, ok) samples.
+    """
+    rewriter = Rewriter(tag, session)
+    start = time.perf_counter()
+    warned = False
+
+    for record in session["requests"]:
+        delay = record["offset"] / speed - (time.perf_counter() - start)
+        if delay > 0:
+            time.sleep(delay)
+
+        body = rewriter.prepare_body(record["path"], record.get("body"))
+        path = rewriter.apply(record["path"])
+        headers = {k: rewriter.apply(v) for k, v in record["headers"].items()}
+        endpoint = endpoint_key(record["method"], record["path"])
+
+        if rewriter.unmapped(path, body, *headers.values()):
+            # Sending it would reuse the recording's token or todos
+            if not warned:
+                print(f"⚠️  {session['session']}: recorded token/ID has no live value, counting as errors")
+                warned = True
+            samples.append((endpoint, 0.0, False))
+            continue
+
+        status, payload, elapsed_ms = send_request(base_url, record["method"], path, headers, body)
+        # Matching the recorded status counts as success (e.g. expected 400s)
+        ok = status != 0 and status == record["status"]
+        samples.append((endpoint, elapsed_ms, ok))
+
+        if record.get("response"):
+            rewriter.learn(parse_json(record["response"]), parse_json(payload))
+
+
+def replay(base_url, sessions, users=1, speed=1.0, iterations=1):
+    """
+    Runs the captured sessions with `users` concurrent virtual users.
+    Each virtual user replays every session `iterations` times.
+    Returns a dict of endpoint -> summary.
+    """
+    samples = []
+    # Differs per replay so a second run against the same database does not
+    # register users that already exist
+    nonce = os.urandom(3).hex()
+
+    def virtual_user(user_id):
+        for iteration in range(iterations):
+            for index, session in enumerate(sessions):
+                replay_session(base_url, session, speed, f"{nonce}v{user_id}i{iteration}s{index}", samples)
+
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        list(pool.map(virtual_user, range(users)))
+
+    grouped = defaultdict(list)
+    for endpoint, elapsed_ms, ok in samples:
+        grouped[endpoint].append((elapsed_ms, ok))
+    return {endpoint: summarize(values) for endpoint, values in grouped.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay captured Selenium API traffic as load")
+    parser.add_argument("capture", help="Traffic file written with CAPTURE_TRAFFIC")
+    parser.add_argument("--url", default=os.getenv("APP_URL", "http://localhost:3000"),
+                        help="Base URL serving /api (default: APP_URL)")
+    parser.add_argument("--users", type=int, default=1, help="Concurrent virtual users")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed multiplier")
+    parser.add_argument("--iterations", type=int, default=1, help="Replays per virtual user")
+    args = parser.parse_args()
+
+    sessions = load_sessions(args.capture)
+    total = sum(len(s["requests"]) for s in sessions)
+
+    print(f"\n{'='*60}")
+    print(f"🔁 Replaying {len(sessions)} sessions ({total} requests)")
+    print(f"   {args.users} users x {args.iterations} iterations at {args.speed}x speed")
+    print(f"{'='*60}\n")
+
+    started = time.time()
+    results = replay(args.url, sessions, args.users, args.speed, args.iterations)
+    print_summary_table(results)
+
+    print(f"\n⏱  Finished in {time.time() - started:.1f}s")
+    failed = sum(s["errors"] for s in results.values())
+    sys.exit(1 if failed else 0)